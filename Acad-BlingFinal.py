@@ -6,25 +6,39 @@ import wx.adv
 import csv
 import os
 import json
-from collections import defaultdict
 from datetime import datetime
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg as FigureCanvas
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
 import math
-import io
+import operator
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import subprocess
-import re  # for safe_float currency handling
-
-# Optional PDF library
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.pdfgen import canvas as pdfcanvas
-    from reportlab.lib.utils import ImageReader
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
+import re
+import atexit
+import pickle
+from types import MappingProxyType
+from functools import lru_cache
+
+# Optional PDF library, imported by the first report rather than at start-up.
+# REPORTLAB_AVAILABLE stays None until _load_reportlab() has probed for it.
+REPORTLAB_AVAILABLE = None
+
+def _load_reportlab():
+    global REPORTLAB_AVAILABLE, A4, pdfcanvas, ImageReader, Image
+    if REPORTLAB_AVAILABLE is None:
+        try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.pdfgen import canvas as pdfcanvas
+            from reportlab.lib.utils import ImageReader
+            from PIL import Image
+            REPORTLAB_AVAILABLE = True
+        except Exception:
+            REPORTLAB_AVAILABLE = False
+    return REPORTLAB_AVAILABLE
 
 # -------------------------
 # File names / Preferences (GLOBAL)
@@ -32,6 +46,9 @@ except Exception:
 FILENAME = "expenses.csv"
 INCOME_FILE = "income.csv"
 PREF_FILE = "preferences.json"
+# Parsed copy of FILENAME, reused at start-up while the CSV is unchanged
+EXPENSE_CACHE_FILE = "expenses.cache.pkl"
+EXPENSE_CACHE_VERSION = 1
 
 # Global references to windows for cross-communication
 WINDOWS = {}
@@ -49,68 +66,354 @@ CURRENCY_OPTIONS = ["₹", "$", "€", "£", "¥", "AED", "AUD", "CAD", "SGD"]
 # -------------------------
 # Preferences helpers
 # -------------------------
+def _file_stamp(filename):
+    st = os.stat(filename)
+    return (st.st_mtime_ns, st.st_size)
+
+# Last preferences known to be on disk, so unchanged saves can be skipped
+_LAST_SAVED_PREFS = None
+# Parsed PREF_FILE, read-only and reused until its (mtime, size) stamp changes
+_PREFS_CACHE = None
+_PREFS_STAT = None
+
 def load_preferences():
+    """
+    Returns the preferences as a read-only mapping (MappingProxyType) on every
+    path, including defaults; use save_preferences() with a new dict to change them.
+    """
+    global _LAST_SAVED_PREFS, _PREFS_CACHE, _PREFS_STAT
     if not os.path.exists(PREF_FILE):
         prefs = {
             "currency_symbol": "₹",
             "default_monthly_budget": 0.0
         }
         save_preferences(prefs)
-        return prefs
+        return MappingProxyType(prefs)
     try:
-        with open(PREF_FILE, "r") as f:
-            return json.load(f)
+        stamp = _file_stamp(PREF_FILE)
+        if stamp != _PREFS_STAT:
+            with open(PREF_FILE, "r") as f:
+                prefs = json.load(f)
+            _PREFS_CACHE = MappingProxyType(prefs)
+            _PREFS_STAT = stamp
+            _LAST_SAVED_PREFS = dict(prefs)
+        return _PREFS_CACHE
     except Exception:
-        return {"currency_symbol": "₹", "default_monthly_budget": 0.0}
+        return MappingProxyType({"currency_symbol": "₹", "default_monthly_budget": 0.0})
 
 def save_preferences(prefs):
+    global _LAST_SAVED_PREFS, _PREFS_CACHE, _PREFS_STAT
+    if prefs == _LAST_SAVED_PREFS and os.path.exists(PREF_FILE):
+        return
     with open(PREF_FILE, "w") as f:
-        json.dump(prefs, f, indent=2)
+        json.dump(prefs, f, separators=(",", ":"))
+    _LAST_SAVED_PREFS = dict(prefs)
+    _PREFS_CACHE = MappingProxyType(dict(prefs))
+    _PREFS_STAT = _file_stamp(PREF_FILE)
 
 PREFS = load_preferences()
 
 # -------------------------
 # CSV helpers
 # -------------------------
+# Parsed CSV contents are cached in memory and reused until the file's
+# (mtime, size) stamp changes, so a refresh does not re-parse unchanged files.
+# Expenses are held column-wise; see _new_expense_columns.
+_EXPENSES_CACHE = None
+_EXPENSES_STAT = None
+_INCOMES_CACHE = None
+_INCOMES_STAT = None
+# Bumped whenever a cache is reloaded or changed by this process. The file stamps
+# only detect external edits: an in-process rewrite of the same size can land in
+# the same mtime tick on coarse-mtime filesystems (FAT/exFAT/HFS+).
+_EXPENSES_GEN = 0
+_INCOMES_GEN = 0
+# Column arrays derived from _EXPENSES_CACHE, rebuilt lazily after it changes
+_EXPENSE_ARRAYS = None
+# Append handle kept open for the process lifetime so adding an expense
+# does not reopen the CSV each time
+_EXPENSE_FH = None
+# CSV stamp the EXPENSE_CACHE_FILE pickle was saved for
+_PICKLED_STAT = None
+
 def ensure_csv_exists(filename, headers):
     if not os.path.exists(filename):
         with open(filename, "w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(headers)
 
-def read_expenses():
+def _new_expense_columns():
+    # Expenses are cached column-wise: row i is index i of every list
+    return {
+        "dates": [],
+        "categories": [],
+        "amounts_txt": [],
+        "notes": [],
+        "amounts": [],        # safe_float of amounts_txt
+        "month_ids": [],      # index into month_keys
+        "cat_ids": [],        # index into category_keys
+        "month_keys": {},     # month key ("" if date unparseable) -> id
+        "category_keys": {}   # category ("Uncategorized" if blank) -> id
+    }
+
+# The per-row lists of the column cache, in _expense_values order
+_ROW_FIELDS = ("dates", "categories", "amounts_txt", "notes", "amounts", "month_ids", "cat_ids")
+
+def _copy_expense_columns(cols):
+    # Edits are made on a copy so the cache only changes once the CSV write succeeds
+    return {field: value.copy() for field, value in cols.items()}
+
+def _expense_values(cols, date, category, amount, note):
+    # Normalised per-row values; new month/category keys are interned into cols
+    date = (date or "").strip()
+    category = (category or "").strip()
+    amount = (amount or "0").strip()
+    month_keys = cols["month_keys"]
+    month_id = month_keys.setdefault(date_to_month_key(date) or "", len(month_keys))
+    category_keys = cols["category_keys"]
+    cat_id = category_keys.setdefault(category or "Uncategorized", len(category_keys))
+    return (date, category, amount, (note or "").strip(), safe_float(amount), month_id, cat_id)
+
+def _append_expense(cols, date, category, amount, note):
+    date, category, amount, note, amt, month_id, cat_id = _expense_values(cols, date, category, amount, note)
+    cols["dates"].append(date)
+    cols["categories"].append(category)
+    cols["amounts_txt"].append(amount)
+    cols["notes"].append(note)
+    cols["amounts"].append(amt)
+    cols["month_ids"].append(month_id)
+    cols["cat_ids"].append(cat_id)
+
+def expense_columns():
+    global _EXPENSES_CACHE, _EXPENSES_STAT, _EXPENSES_GEN, _EXPENSE_ARRAYS
     ensure_csv_exists(FILENAME, ["Date", "Category", "Amount", "Note"])
-    rows = []
-    with open(FILENAME, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rows.append({
-                "Date": (r.get("Date") or "").strip(),
-                "Category": (r.get("Category") or "").strip(),
-                "Amount": (r.get("Amount") or "0").strip(),
-                "Note": (r.get("Note") or "").strip()
-            })
-    return rows
+    stamp = _file_stamp(FILENAME)
+    if _EXPENSES_CACHE is not None and _EXPENSES_STAT == stamp:
+        return _EXPENSES_CACHE
+    cols = _load_expense_pickle(stamp)
+    if cols is None:
+        cols = _new_expense_columns()
+        with open(FILENAME, "r", newline="", buffering=1 << 20) as f:
+            reader = csv.DictReader(f)
+            for r in reader:
+                _append_expense(cols, r.get("Date"), r.get("Category"), r.get("Amount"), r.get("Note"))
+        _save_expense_pickle(stamp, cols)
+    _EXPENSES_CACHE = cols
+    _EXPENSES_STAT = stamp
+    _EXPENSES_GEN += 1
+    _EXPENSE_ARRAYS = None
+    return cols
+
+def _load_expense_pickle(stamp):
+    # Returns the pickled columns if they were parsed from a CSV with this stamp
+    global _PICKLED_STAT
+    try:
+        with open(EXPENSE_CACHE_FILE, "rb") as f:
+            saved = pickle.load(f)
+        if saved.get("version") == EXPENSE_CACHE_VERSION and saved.get("stamp") == stamp:
+            _PICKLED_STAT = stamp
+            return saved["data"]
+    except Exception:
+        pass
+    return None
 
-def write_expenses(expenses):
+def _save_expense_pickle(stamp, cols):
+    global _PICKLED_STAT
+    tmp = EXPENSE_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": EXPENSE_CACHE_VERSION, "stamp": stamp, "data": cols},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, EXPENSE_CACHE_FILE)
+        _PICKLED_STAT = stamp
+    except Exception:
+        pass
+
+def get_expense_row(i, cols=None):
+    if cols is None:
+        cols = expense_columns()
+    return {
+        "Date": cols["dates"][i],
+        "Category": cols["categories"][i],
+        "Amount": cols["amounts_txt"][i],
+        "Note": cols["notes"][i]
+    }
+
+def iter_expenses(indices=None):
+    # Yields row dicts lazily, optionally only for the given row indices
+    cols = expense_columns()
+    if indices is not None:
+        for i in indices:
+            yield get_expense_row(i, cols)
+        return
+    for date, cat, amt, note in zip(cols["dates"], cols["categories"], cols["amounts_txt"], cols["notes"]):
+        yield {"Date": date, "Category": cat, "Amount": amt, "Note": note}
+
+def read_expenses():
+    # Row dicts built from the column cache; callers may modify them freely
+    return list(iter_expenses())
+
+def _write_expense_columns(cols):
+    # Rewrites the CSV from a column cache, which becomes the current cache only
+    # if the write succeeds
+    global _EXPENSES_CACHE, _EXPENSES_STAT, _EXPENSES_GEN, _EXPENSE_ARRAYS
     ensure_csv_exists(FILENAME, ["Date", "Category", "Amount", "Note"])
-    with open(FILENAME, "w", newline="") as f:
+    with open(FILENAME, "w", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(["Date", "Category", "Amount", "Note"])
-        for r in expenses:
-            writer.writerow([r["Date"], r["Category"], r["Amount"], r.get("Note", "")])
+        writer.writerows(zip(cols["dates"], cols["categories"], cols["amounts_txt"], cols["notes"]))
+    _EXPENSES_CACHE = cols
+    _EXPENSES_STAT = _file_stamp(FILENAME)
+    _EXPENSES_GEN += 1
+    _EXPENSE_ARRAYS = None
+    _save_expense_pickle(_EXPENSES_STAT, cols)
 
-def add_expense(date, category, amount, note=""):
+def write_expenses(expenses):
+    cols = _new_expense_columns()
+    for r in expenses:
+        _append_expense(cols, r["Date"], r["Category"], r["Amount"], r.get("Note", ""))
+    _write_expense_columns(cols)
+
+def update_expense(index, date, category, amount, note=""):
+    # Edits one row of the cached columns; returns False if the row no longer exists
+    cols = expense_columns()
+    if not 0 <= index < len(cols["dates"]):
+        return False
+    cols = _copy_expense_columns(cols)
+    for field, value in zip(_ROW_FIELDS, _expense_values(cols, date, category, amount, note)):
+        cols[field][index] = value
+    _write_expense_columns(cols)
+    return True
+
+def delete_expense(index):
+    cols = expense_columns()
+    if not 0 <= index < len(cols["dates"]):
+        return False
+    cols = _copy_expense_columns(cols)
+    for field in _ROW_FIELDS:
+        del cols[field][index]
+    _write_expense_columns(cols)
+    return True
+
+def _expense_handle():
+    global _EXPENSE_FH
     ensure_csv_exists(FILENAME, ["Date", "Category", "Amount", "Note"])
-    with open(FILENAME, "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([date, category, amount, note])
+    # Reopen if the CSV was deleted/replaced behind our back
+    if (_EXPENSE_FH is None or _EXPENSE_FH.closed
+            or os.fstat(_EXPENSE_FH.fileno()).st_ino != os.stat(FILENAME).st_ino):
+        _close_expense_handle()
+        _EXPENSE_FH = open(FILENAME, "a", newline="", buffering=1 << 16)
+    return _EXPENSE_FH
+
+def _close_expense_handle():
+    if _EXPENSE_FH is not None and not _EXPENSE_FH.closed:
+        _EXPENSE_FH.close()
+
+def _shutdown_expense_cache():
+    # add_expense only appends to the CSV, so the pickle is brought up to date
+    # once here rather than after every added row
+    _close_expense_handle()
+    try:
+        if (_EXPENSES_CACHE is not None and _EXPENSES_STAT != _PICKLED_STAT
+                and _EXPENSES_STAT == _file_stamp(FILENAME)):
+            _save_expense_pickle(_EXPENSES_STAT, _EXPENSES_CACHE)
+    except Exception:
+        pass
+
+atexit.register(_shutdown_expense_cache)
+
+def add_expense(date, category, amount, note=""):
+    global _EXPENSES_STAT, _EXPENSES_GEN, _EXPENSE_ARRAYS
+    fh = _expense_handle()
+    # Only extend the cache if it still mirrors the file; otherwise the next read re-parses
+    fresh = _EXPENSES_CACHE is not None and _EXPENSES_STAT == _file_stamp(FILENAME)
+    csv.writer(fh).writerow([date, category, amount, note])
+    fh.flush()
+    if fresh:
+        _append_expense(_EXPENSES_CACHE, date, category, amount, note)
+        st = os.fstat(fh.fileno())
+        _EXPENSES_STAT = (st.st_mtime_ns, st.st_size)
+        _EXPENSES_GEN += 1
+    _EXPENSE_ARRAYS = None
+
+def _expense_arrays():
+    """
+    NumPy copies of the cached expense columns for vectorised aggregation:
+        amounts   -> float64 amount per row
+        month_ids -> index into months (month key per row, "" if unparseable)
+        cat_ids   -> index into categories ("Uncategorized" for blank)
+    """
+    global _EXPENSE_ARRAYS
+    cols = expense_columns()
+    if _EXPENSE_ARRAYS is not None:
+        return _EXPENSE_ARRAYS
+    _EXPENSE_ARRAYS = {
+        "amounts": np.asarray(cols["amounts"], dtype=np.float64),
+        "month_ids": np.asarray(cols["month_ids"], dtype=np.intp),
+        "cat_ids": np.asarray(cols["cat_ids"], dtype=np.intp),
+        "months": list(cols["month_keys"]),
+        "categories": list(cols["category_keys"])
+    }
+    return _EXPENSE_ARRAYS
+
+# Expense totals shared by the Charts and Suggestions windows (see compute_aggregates)
+AGGREGATES = {
+    "stat_key": None,
+    "month_totals": {},
+    "category_totals": {},
+    "cat_by_month": {}
+}
+
+def compute_aggregates():
+    """
+    Aggregate the cached expenses once per change of the expense cache:
+        month_totals    -> {month: total}, "" collects rows with no parseable date
+        category_totals -> {category: total} over all rows
+        cat_by_month    -> {month: {category: total}}
+    Returns AGGREGATES; each recompute stores fresh dicts rather than mutating.
+    """
+    arrays = _expense_arrays()
+    stat_key = (_EXPENSES_STAT, _EXPENSES_GEN)
+    if AGGREGATES["stat_key"] == stat_key:
+        return AGGREGATES
+    amounts = arrays["amounts"]
+    month_ids = arrays["month_ids"]
+    cat_ids = arrays["cat_ids"]
+    months = arrays["months"]
+    cats = arrays["categories"]
+    n_m, n_c = len(months), len(cats)
+
+    # Edits and deletes can leave interned keys with no rows; those are skipped
+    month_totals = {m: t for m, t, k in zip(months,
+                                             np.bincount(month_ids, weights=amounts, minlength=n_m).tolist(),
+                                             np.bincount(month_ids, minlength=n_m).tolist()) if k}
+    category_totals = {c: t for c, t, k in zip(cats,
+                                                np.bincount(cat_ids, weights=amounts, minlength=n_c).tolist(),
+                                                np.bincount(cat_ids, minlength=n_c).tolist()) if k}
+    # Month x category totals over the occupied (month, category) cells only
+    cells = month_ids * n_c + cat_ids
+    cell_totals = np.bincount(cells, weights=amounts, minlength=n_m * n_c).tolist()
+    cat_by_month = {}
+    for cell in np.unique(cells).tolist():
+        cat_by_month.setdefault(months[cell // n_c], {})[cats[cell % n_c]] = cell_totals[cell]
+
+    AGGREGATES.update({
+        "stat_key": stat_key,
+        "month_totals": month_totals,
+        "category_totals": category_totals,
+        "cat_by_month": cat_by_month
+    })
+    return AGGREGATES
 
 # Income CSV helpers
 def read_incomes():
+    global _INCOMES_CACHE, _INCOMES_STAT, _INCOMES_GEN
     ensure_csv_exists(INCOME_FILE, ["Month", "Income"])
+    stamp = _file_stamp(INCOME_FILE)
+    if _INCOMES_CACHE is not None and _INCOMES_STAT == stamp:
+        return _INCOMES_CACHE
     incomes = {}
-    with open(INCOME_FILE, "r", newline="") as f:
+    with open(INCOME_FILE, "r", newline="", buffering=1 << 20) as f:
         reader = csv.DictReader(f)
         for r in reader:
             m = (r.get("Month") or "").strip()
@@ -118,30 +421,49 @@ def read_incomes():
                 incomes[m] = float((r.get("Income") or "0").strip())
             except Exception:
                 incomes[m] = 0.0
+    _INCOMES_CACHE = incomes
+    _INCOMES_STAT = stamp
+    _INCOMES_GEN += 1
     return incomes
 
 def write_incomes(incomes):
+    global _INCOMES_CACHE, _INCOMES_STAT, _INCOMES_GEN
     ensure_csv_exists(INCOME_FILE, ["Month", "Income"])
-    with open(INCOME_FILE, "w", newline="") as f:
+    with open(INCOME_FILE, "w", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(["Month", "Income"])
-        for month, amt in incomes.items():
-            writer.writerow([month, f"{amt:.2f}"])
+        writer.writerows([month, f"{amt:.2f}"] for month, amt in incomes.items())
+    _INCOMES_CACHE = {month: float(f"{amt:.2f}") for month, amt in incomes.items()}
+    _INCOMES_STAT = _file_stamp(INCOME_FILE)
+    _INCOMES_GEN += 1
 
 def set_income_for_month(month_key, amount):
-    incomes = read_incomes()
+    # Copy: read_incomes() returns the cache, which must not change unless the write succeeds
+    incomes = dict(read_incomes())
     incomes[month_key] = float(amount)
     write_incomes(incomes)
 
 # -------------------------
 # Utilities
 # -------------------------
+# ISO dates as written by on_add_expense, e.g. "2024-03-09"
+_YMD_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# Dates repeat heavily across rows (many expenses per day), so results are memoised
+@lru_cache(maxsize=8192)
 def date_to_month_key(date_str):
+    if _YMD_RE.fullmatch(date_str):
+        # Already "YYYY-MM-DD", so the month key is just its prefix
+        return date_str[:7]
+    return _month_key_fallback(date_str)
+
+def _month_key_fallback(date_str):
     try:
-        d = datetime.strptime(date_str, "%Y-%m-%d")
+        # C-implemented ISO parser; also covers timestamps like "2024-03-09T10:00"
+        d = datetime.fromisoformat(date_str[:10])
     except Exception:
         try:
-            d = datetime.fromisoformat(date_str)
+            d = datetime.strptime(date_str, "%Y-%m-%d")
         except Exception:
             try:
                 parts = [int(p) for p in date_str.split("-") if p.strip()]
@@ -153,6 +475,12 @@ def date_to_month_key(date_str):
                 return None
     return f"{d.year:04d}-{d.month:02d}"
 
+# Every byte except digits, dot and minus. Applied to the UTF-8 encoding, this also
+# removes multi-byte currency symbols such as "₹", whose bytes are all >= 0x80.
+_DROP_BYTES = bytes(c for c in range(256) if c not in b"0123456789.-")
+# A digit other than 0-9 (e.g. Arabic-Indic "١٢٣"); the byte filter would drop it
+_NON_ASCII_DIGIT_RE = re.compile(r"[^\D0-9]")
+
 def safe_float(x):
     """
     Safely convert amount strings that may contain currency symbols, commas, etc.
@@ -162,10 +490,11 @@ def safe_float(x):
         " 300 " -> 300.0
     """
     try:
-        s = str(x).strip()
-        # Remove everything except digits, dot, minus
-        cleaned = "".join(ch for ch in s if (ch.isdigit() or ch in ".-"))
-        if not cleaned:
+        s = str(x)
+        if not s.isascii() and _NON_ASCII_DIGIT_RE.search(s):
+            return float("".join(ch for ch in s if ch.isdigit() or ch in ".-"))
+        cleaned = s.encode("utf-8").translate(None, _DROP_BYTES)
+        if cleaned in (b"", b"-", b".", b"-."):
             return 0.0
         return float(cleaned)
     except Exception:
@@ -281,6 +610,24 @@ class SIPDialog(wx.Dialog):
 # -------------------------
 # WINDOW 1: Entry Panel (Input + Table)
 # -------------------------
+class ExpenseListCtrl(wx.ListCtrl):
+    # Virtual report list: cells are pulled from the expense column cache on
+    # paint, so a refresh only updates the item count instead of re-inserting rows
+    FIELDS = ("dates", "categories", "amounts_txt", "notes")
+
+    def __init__(self, parent):
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.BORDER_SUNKEN)
+        self.cols = _new_expense_columns()
+
+    def set_columns(self, cols):
+        self.cols = cols
+        self.SetItemCount(len(cols["dates"]))
+        self.Refresh()
+
+    def OnGetItemText(self, item, col):
+        values = self.cols[self.FIELDS[col]]
+        return values[item] if item < len(values) else ""
+
 class EntryWindow(wx.Frame):
     def __init__(self):
         super().__init__(None, title="📝 Expense Entry", size=(900, 620))
@@ -386,7 +733,7 @@ class EntryWindow(wx.Frame):
         sizer.Add(inc_box, 0, wx.LEFT | wx.RIGHT | wx.TOP, 12)
 
         # Expense table
-        self.table = wx.ListCtrl(card, style=wx.LC_REPORT | wx.BORDER_SUNKEN)
+        self.table = ExpenseListCtrl(card)
         self.table.InsertColumn(0, "Date", width=110)
         self.table.InsertColumn(1, "Category", width=180)
         self.table.InsertColumn(2, "Amount", width=130)
@@ -439,20 +786,14 @@ class EntryWindow(wx.Frame):
         refresh_all_windows()
 
     def load_table(self):
-        self.table.DeleteAllItems()
-        for row in read_expenses():
-            idx = self.table.InsertItem(self.table.GetItemCount(), row["Date"])
-            self.table.SetItem(idx, 1, row["Category"])
-            self.table.SetItem(idx, 2, row["Amount"])
-            self.table.SetItem(idx, 3, row.get("Note",""))
+        self.table.set_columns(expense_columns())
 
     def on_edit_expense(self, event):
         idx = event.GetIndex()
-        date = self.table.GetItemText(idx, 0)
-        cat = self.table.GetItemText(idx, 1)
-        amt = self.table.GetItemText(idx, 2)
-        note = self.table.GetItemText(idx, 3)
-        dlg = EditExpenseDialog(self, idx, date, cat, amt, note)
+        if not 0 <= idx < len(self.table.cols["dates"]):
+            return
+        row = get_expense_row(idx, self.table.cols)
+        dlg = EditExpenseDialog(self, idx, row["Date"], row["Category"], row["Amount"], row.get("Note",""))
         dlg.ShowModal()
         dlg.Destroy()
         self.load_table()
@@ -477,6 +818,24 @@ class EntryWindow(wx.Frame):
 # -------------------------
 # WINDOW 2: Charts Window
 # -------------------------
+class ChartCanvas(FigureCanvas):
+    """
+    Canvas whose figure is also drawn by ChartsWindow's render thread. wx's own
+    paint/resize handlers redraw or resize the same figure on the UI thread, so
+    they take the window's render lock and wait for a render in progress.
+    """
+    def __init__(self, parent, id, figure, lock):
+        self._render_lock = lock
+        super().__init__(parent, id, figure)
+
+    def draw(self, drawDC=None):
+        with self._render_lock:
+            super().draw(drawDC=drawDC)
+
+    def _on_size(self, event):
+        with self._render_lock:
+            super()._on_size(event)
+
 class ChartsWindow(wx.Frame):
     def __init__(self):
         super().__init__(None, title="📊 Analytics Dashboard", size=(900, 720))
@@ -499,8 +858,26 @@ class ChartsWindow(wx.Frame):
         subtitle.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.LIGHT))
         sizer.Add(subtitle, 0, wx.ALL | wx.ALIGN_CENTER_HORIZONTAL, 2)
 
+        # Rendering runs on a worker thread; the lock serialises renders (and the
+        # canvas's own redraws) and _render_gen lets a queued render skip itself
+        # when a newer one exists. Reentrant because the first render runs on the
+        # UI thread, where a nested canvas redraw must not deadlock.
+        self._render_lock = threading.RLock()
+        self._render_gen = 0
+
         self.figure = Figure(figsize=(8,6), dpi=100)
-        self.canvas = FigureCanvas(card, -1, self.figure)
+        self.canvas = ChartCanvas(card, -1, self.figure, self._render_lock)
+        # Cache keys the charts were last drawn from; see update_charts
+        self._last_key = None
+
+        # Axes are created once; update_charts resizes the existing bars when
+        # the number of bars is unchanged instead of rebuilding the figure
+        self.ax_income = self.figure.add_subplot(2,2,1)
+        self.ax_cat = self.figure.add_subplot(2,2,3)
+        self.ax_pie = self.figure.add_subplot(2,2,2)
+        self._bars_inc = None
+        self._bars_exp = None
+        self._bars_cat = None
         sizer.Add(self.canvas, 1, wx.EXPAND | wx.ALL, 8)
 
         # Control buttons
@@ -508,7 +885,7 @@ class ChartsWindow(wx.Frame):
         refresh_btn = wx.Button(card, label="🔄 Refresh Charts")
         refresh_btn.SetBackgroundColour(BTN_PRIMARY)
         refresh_btn.SetForegroundColour(wx.WHITE)
-        refresh_btn.Bind(wx.EVT_BUTTON, lambda e: self.update_charts())
+        refresh_btn.Bind(wx.EVT_BUTTON, lambda e: self.update_charts(force=True))
         btn_sizer.Add(refresh_btn, 0, wx.ALL, 5)
         
         open_entry_btn = wx.Button(card, label="📝 Open Entry")
@@ -527,7 +904,7 @@ class ChartsWindow(wx.Frame):
         outer.Add(card, 1, wx.ALL | wx.EXPAND, 10)
         self.SetSizer(outer)
         
-        self.update_charts()
+        self.update_charts(background=False)
         self.Show()
 
     def on_close(self, event):
@@ -546,49 +923,93 @@ class ChartsWindow(wx.Frame):
             WINDOWS[win_type].Show()
             WINDOWS[win_type].Raise()
 
-    def update_charts(self):
-        expenses = read_expenses()
-        incomes = read_incomes()
+    def update_charts(self, force=False, background=True):
+        # Snapshot the shared aggregates: the render thread must not see them swapped mid-draw
+        aggregates = dict(compute_aggregates())
+        incomes = dict(read_incomes())
 
-        category_totals = defaultdict(float)
-        month_totals = defaultdict(float)
-        month_category = defaultdict(lambda: defaultdict(float))
+        # Redrawing the figure is the expensive part; skip it when neither CSV changed
+        key = (aggregates["stat_key"], _INCOMES_STAT, _INCOMES_GEN, datetime.now().strftime("%Y-%m"))
+        if not force and key == self._last_key:
+            return
+        self._last_key = key
 
-        for r in expenses:
-            amt = safe_float(r["Amount"]) 
-            cat = r["Category"] or "Uncategorized"
-            mkey = date_to_month_key(r["Date"]) or datetime.now().strftime("%Y-%m")
-            category_totals[cat] += amt
-            month_totals[mkey] += amt
-            month_category[mkey][cat] += amt
+        self._render_gen += 1
+        if background:
+            threading.Thread(target=self._rebuild, args=(self._render_gen, aggregates, incomes), daemon=True).start()
+        else:
+            self._rebuild(self._render_gen, aggregates, incomes)
+
+    def _rebuild(self, gen, aggregates, incomes):
+        with self._render_lock:
+            # A newer refresh was requested while waiting; it will draw instead
+            if gen != self._render_gen:
+                return
+            self._draw_figure(aggregates, incomes)
+            # Rasterise into the Agg buffer only; wx calls stay on the UI thread
+            FigureCanvasAgg.draw(self.canvas)
+        wx.CallAfter(self._show_render)
+
+    def _show_render(self):
+        if not self:  # window was closed while rendering
+            return
+        # If another render holds the lock it will blit when done; don't read a half-drawn buffer
+        if self._render_lock.acquire(blocking=False):
+            try:
+                self.canvas.blit()
+            finally:
+                self._render_lock.release()
+
+    def _draw_figure(self, aggregates, incomes):
+        category_totals = aggregates["category_totals"]
+        month_totals = dict(aggregates["month_totals"])
+        # Undated rows are shown under the current month
+        if "" in month_totals:
+            now_month = datetime.now().strftime("%Y-%m")
+            month_totals[now_month] = month_totals.get(now_month, 0.0) + month_totals.pop("")
 
         months = sorted(set(list(month_totals.keys()) + list(incomes.keys())))
         if not months:
             months = [datetime.now().strftime("%Y-%m")]
 
-        self.figure.clear()
-        ax_income = self.figure.add_subplot(2,2,1)
-        ax_cat = self.figure.add_subplot(2,2,3)
-        ax_pie = self.figure.add_subplot(2,2,2)
+        ax_income = self.ax_income
+        ax_cat = self.ax_cat
+        ax_pie = self.ax_pie
 
         inc_vals = [incomes.get(m, 0.0) for m in months]
         exp_vals = [month_totals.get(m, 0.0) for m in months]
-        x = range(len(months))
-        w = 0.35
-        ax_income.bar([i - w/2 for i in x], inc_vals, w, label="Income")
-        ax_income.bar([i + w/2 for i in x], exp_vals, w, label="Expenditure")
-        ax_income.set_xticks(list(x))
+        x = list(range(len(months)))
+        if self._bars_inc is not None and len(self._bars_inc) == len(months):
+            self._set_bar_heights(self._bars_inc, inc_vals)
+            self._set_bar_heights(self._bars_exp, exp_vals)
+            ax_income.relim()
+            ax_income.autoscale_view()
+        else:
+            ax_income.cla()
+            w = 0.35
+            self._bars_inc = ax_income.bar([i - w/2 for i in x], inc_vals, w, label="Income")
+            self._bars_exp = ax_income.bar([i + w/2 for i in x], exp_vals, w, label="Expenditure")
+            ax_income.set_title("Monthly Income vs Expenditure")
+            ax_income.legend(fontsize=8)
+        ax_income.set_xticks(x)
         ax_income.set_xticklabels(months, rotation=45, fontsize=8)
-        ax_income.set_title("Monthly Income vs Expenditure")
-        ax_income.legend(fontsize=8)
 
         sorted_categories = sorted(category_totals.items(), key=lambda kv: kv[1], reverse=True)
         top_n = 10
         cats = [c for c,v in sorted_categories[:top_n]] or ["No data"]
         vals = [v for c,v in sorted_categories[:top_n]] or [0]
-        ax_cat.bar(cats, vals, color="#74b9ff")
-        ax_cat.set_title("Top Categories (All time)")
-        ax_cat.tick_params(axis='x', rotation=45, labelsize=8)
+        # Numeric positions + tick labels, so category names can change between updates
+        cat_x = list(range(len(cats)))
+        if self._bars_cat is not None and len(self._bars_cat) == len(cats):
+            self._set_bar_heights(self._bars_cat, vals)
+            ax_cat.relim()
+            ax_cat.autoscale_view()
+        else:
+            ax_cat.cla()
+            self._bars_cat = ax_cat.bar(cat_x, vals, color="#74b9ff")
+            ax_cat.set_title("Top Categories (All time)")
+        ax_cat.set_xticks(cat_x)
+        ax_cat.set_xticklabels(cats, rotation=45, fontsize=8)
 
         pie_top = sorted_categories[:6]
         labels = [c for c,v in pie_top]
@@ -599,11 +1020,16 @@ class ChartsWindow(wx.Frame):
             sizes.append(others_sum)
         if sum(sizes) == 0:
             labels = ["No data"]; sizes = [1]
+        # Wedges cannot be resized in place, so only the pie axes is redrawn
+        ax_pie.cla()
         ax_pie.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=140)
         ax_pie.set_title("Category Share (Top)")
 
         self.figure.tight_layout()
-        self.canvas.draw()
+
+    def _set_bar_heights(self, bars, heights):
+        for bar, h in zip(bars, heights):
+            bar.set_height(h)
 
 # -------------------------
 # WINDOW 3: Suggestions Window
@@ -634,6 +1060,9 @@ class SuggestionsWindow(wx.Frame):
         self.info.SetMinSize((520, 320))
         self.info.SetBackgroundColour(wx.Colour(250, 252, 255))
         sizer.Add(self.info, 1, wx.EXPAND | wx.ALL, 8)
+        # Inputs the last suggestion text was built from; see get_suggestion_text
+        self._last_key = None
+        self._last_text = ""
 
         # Action buttons
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -706,53 +1135,65 @@ class SuggestionsWindow(wx.Frame):
                 pass
 
         incomes = read_incomes()
-        expenses = read_expenses()
-        month_totals = defaultdict(float)
-        
-        for r in expenses:
-            mkey = date_to_month_key(r["Date"]) or current_month
-            month_totals[mkey] += safe_float(r["Amount"])
-        
+        aggregates = compute_aggregates()
+
+        key = (aggregates["stat_key"], _INCOMES_STAT, _INCOMES_GEN, current_month, PREFS.get('currency_symbol','₹'))
+        if key == self._last_key:
+            return self._last_text
+
+        # Undated rows count toward the selected month's total but not its categories
+        month_totals = aggregates["month_totals"]
+        mcat = aggregates["cat_by_month"].get(current_month, {})
+
         inc = incomes.get(current_month, 0.0)
-        exp = month_totals.get(current_month, 0.0)
+        exp = month_totals.get(current_month, 0.0) + month_totals.get("", 0.0)
         diff = inc - exp
 
-        suggestion_text = f"📅 Month: {current_month}\n"
-        suggestion_text += f"💰 Income: {PREFS.get('currency_symbol','₹')}{inc:.2f}\n"
-        suggestion_text += f"💸 Expenditure: {PREFS.get('currency_symbol','₹')}{exp:.2f}\n"
-        suggestion_text += f"⚖  Balance: {PREFS.get('currency_symbol','₹')}{diff:.2f}\n\n"
+        sym = PREFS.get('currency_symbol','₹')
+        lines = [
+            f"📅 Month: {current_month}",
+            f"💰 Income: {sym}{inc:.2f}",
+            f"💸 Expenditure: {sym}{exp:.2f}",
+            f"⚖  Balance: {sym}{diff:.2f}",
+            ""
+        ]
 
         if inc == 0:
-            suggestion_text += "⚠ No income set for this month.\nSet monthly income to enable better insights.\n\n"
+            lines += ["⚠ No income set for this month.", "Set monthly income to enable better insights.", ""]
 
-        mcat = defaultdict(float)
-        for r in expenses:
-            if date_to_month_key(r["Date"]) == current_month:
-                mcat[r["Category"] or "Uncategorized"] += safe_float(r["Amount"])
-        
         if mcat:
-            suggestion_text += "📋 This month's top categories:\n"
+            lines.append("📋 This month's top categories:")
             for c,v in sorted(mcat.items(), key=lambda kv: kv[1], reverse=True)[:6]:
-                suggestion_text += f"  • {c}: {PREFS.get('currency_symbol','₹')}{v:.2f}\n"
+                lines.append(f"  • {c}: {sym}{v:.2f}")
 
         # Overspending alert
         if inc > 0 and exp > inc:
             over_amount = exp - inc
-            suggestion_text += (
-                f"\n🚨 You have spent too much!\n"
-                f"Expenditure exceeds income by {PREFS.get('currency_symbol','₹')}{over_amount:.2f}\n"
-                "💡 Review top spending categories above and cut back where possible.\n\n"
-            )
+            lines += [
+                "",
+                "🚨 You have spent too much!",
+                f"Expenditure exceeds income by {sym}{over_amount:.2f}",
+                "💡 Review top spending categories above and cut back where possible.",
+                ""
+            ]
         elif diff >= 1000:
-            suggestion_text += (
-                f"\n✅ Great! {PREFS.get('currency_symbol','₹')}{diff:.2f} available to save.\n"
-                "💡 Consider automated SIP investments.\n\n"
-            )
-
-        suggestion_text += "🔧 Quick Actions:\n"
-        suggestion_text += "• Click 'Start SIP' for investment calculator\n"
-        suggestion_text += "• Set income in Entry window\n"
-        suggestion_text += "• Generate PDF reports monthly\n"
+            lines += [
+                "",
+                f"✅ Great! {sym}{diff:.2f} available to save.",
+                "💡 Consider automated SIP investments.",
+                ""
+            ]
+
+        lines += [
+            "🔧 Quick Actions:",
+            "• Click 'Start SIP' for investment calculator",
+            "• Set income in Entry window",
+            "• Generate PDF reports monthly",
+            ""  # keeps the trailing newline
+        ]
+        suggestion_text = "\n".join(lines)
+        self._last_key = key
+        self._last_text = suggestion_text
         return suggestion_text
 
     def update_text(self, text=None):
@@ -784,6 +1225,9 @@ class SuggestionsWindow(wx.Frame):
                 style=wx.OK | wx.ICON_INFORMATION
             )
             return
+        # Release our append handle so the external editor can save the file;
+        # _expense_handle() reopens it on the next added expense
+        _close_expense_handle()
         try:
             if os.name == "nt":  # Windows
                 os.startfile(FILENAME)
@@ -802,8 +1246,6 @@ class SuggestionsWindow(wx.Frame):
 # PDF Report Generator (Modal Dialog)
 # -------------------------
 def generate_pdf_report_dialog(parent):
-    print("generate_pdf_report_dialog called")
-
     month_key = datetime.now().strftime("%Y-%m")
 
     if 'entry' in WINDOWS:
@@ -815,11 +1257,22 @@ def generate_pdf_report_dialog(parent):
         except Exception:
             pass
 
-    expenses = read_expenses()
-    rows = [r for r in expenses if date_to_month_key(r["Date"]) == month_key]
-    if not rows:
+    # Filter and group with numpy on the cached columns; month ids were parsed
+    # when the cache was built, so no date is re-parsed here
+    cols = expense_columns()
+    arrays = _expense_arrays()
+    month_id = cols["month_keys"].get(month_key, -1)
+    idx = np.flatnonzero(arrays["month_ids"] == month_id)
+    month_cats = arrays["cat_ids"][idx]
+    sums = np.bincount(month_cats, weights=arrays["amounts"][idx], minlength=len(arrays["categories"])).tolist()
+    # Categories in order of first appearance within the month
+    uniq, first = np.unique(month_cats, return_index=True)
+    cat_totals = {arrays["categories"][c]: sums[c] for c in uniq[np.argsort(first)].tolist()}
+    if not idx.size:
         wx.MessageBox(f"No expenses found for {month_key}", "No Data", style=wx.OK | wx.ICON_INFORMATION)
         return
+    # Only the month's rows become dicts; they are copies, so later edits on the UI thread can't shift them
+    rows = list(iter_expenses(idx.tolist()))
 
     with wx.FileDialog(parent, "Save PDF report",
                        wildcard="PDF files (.pdf)|.pdf",
@@ -830,64 +1283,106 @@ def generate_pdf_report_dialog(parent):
         if not path.lower().endswith(".pdf"):
             path += ".pdf"
 
-    cat_totals = defaultdict(float)
-    for r in rows:
-        cat_totals[r["Category"] or "Uncategorized"] += safe_float(r["Amount"]) 
-
-    fig = Figure(figsize=(6,4), dpi=150)
-    ax = fig.add_subplot(111)
-    labels = list(cat_totals.keys())[:6]
-    sizes = [cat_totals[k] for k in labels]
-    if sum(sizes) == 0:
-        labels = ["No data"]; sizes = [1]
-    ax.pie(sizes, labels=labels, autopct="%1.1f%%")
-    ax.set_title(f"Category share — {month_key}")
+    # Income and currency are read here; the worker thread must not touch the shared caches
+    income = read_incomes().get(month_key, 0.0)
+    sym = PREFS.get('currency_symbol','₹')
+    _EXECUTOR.submit(_build_pdf_report, path, month_key, rows, cat_totals, income, sym)
+
+# PDF reports are built one at a time on this worker, which also makes it the
+# only user of the pie figure below
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Pie figure reused across PDF reports instead of building a new Figure each time
+_PIE_FIG = None
+_PIE_AX = None
+
+def _render_report_pie(top, month_key):
+    # top is (category, total) pairs, largest first. Zero and negative totals
+    # (refunds) cannot be wedges, so they are left out; returns False without
+    # touching matplotlib when fewer than two categories remain
+    global _PIE_FIG, _PIE_AX
+    top = [(cat, amt) for cat, amt in top if amt > 0]
+    if len(top) <= 1:
+        return False
+    if _PIE_FIG is None:
+        # 5x3in at 100dpi is 500x300px, one pixel per point of the PDF image box
+        _PIE_FIG = Figure(figsize=(5,3), dpi=100)
+        FigureCanvasAgg(_PIE_FIG)
+        _PIE_AX = _PIE_FIG.add_subplot(111)
+    else:
+        _PIE_AX.clear()
+    labels = [cat for cat, _ in top]
+    sizes = [amt for _, amt in top]
+    _PIE_AX.pie(sizes, labels=labels, autopct="%1.1f%%")
+    _PIE_AX.set_title(f"Category share — {month_key}")
+    _PIE_AX.set_rasterized(True)
+    return True
+
+def _build_pdf_report(path, month_key, rows, cat_totals, income, sym):
+    # Runs on _EXECUTOR, whose Future is discarded, so any error not already
+    # reported by _write_pdf_report is shown here
+    try:
+        _write_pdf_report(path, month_key, rows, cat_totals, income, sym)
+    except Exception as e:
+        wx.CallAfter(wx.MessageBox, f"Failed to create report: {e}", "Error", style=wx.OK | wx.ICON_ERROR)
 
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
+def _write_pdf_report(path, month_key, rows, cat_totals, income, sym):
+    # Reports back via wx.CallAfter
+    # One sort feeds both the pie (top 6) and the top-expenses list (top 10)
+    ordered = sorted(cat_totals.items(), key=operator.itemgetter(1), reverse=True)
+    has_pie = _render_report_pie(ordered[:6], month_key)
 
-    if REPORTLAB_AVAILABLE:
+    if _load_reportlab():
         try:
             c = pdfcanvas.Canvas(path, pagesize=A4)
             width, height = A4
             c.setFont("Helvetica-Bold", 14)
             c.drawString(40, height-60, f"Monthly Expense Report — {month_key}")
 
-            total = sum(safe_float(r["Amount"]) for r in rows)
-            incomes = read_incomes()
-            income = incomes.get(month_key, 0.0)
+            # Category totals already cover every row of the month
+            total = sum(cat_totals.values())
             c.setFont("Helvetica", 10)
-            c.drawString(40, height-90, f"Income: {PREFS.get('currency_symbol','₹')}{income:.2f}")
-            c.drawString(200, height-90, f"Expenditure: {PREFS.get('currency_symbol','₹')}{total:.2f}")
-
-            img = ImageReader(buf)
-            c.drawImage(img, 40, height-420, width=500, height=300, preserveAspectRatio=True, anchor='sw')
+            c.drawString(40, height-90, f"Income: {sym}{income:.2f}")
+            c.drawString(200, height-90, f"Expenditure: {sym}{total:.2f}")
+
+            if has_pie:
+                # Hand the Agg RGBA buffer straight to reportlab, no PNG round trip
+                _PIE_FIG.canvas.draw()
+                w, h = _PIE_FIG.canvas.get_width_height()
+                img = ImageReader(Image.frombuffer("RGBA", (w, h), _PIE_FIG.canvas.buffer_rgba(), "raw", "RGBA", 0, 1))
+                c.drawImage(img, 40, height-420, width=500, height=300, preserveAspectRatio=True, anchor='sw')
+            else:
+                c.drawString(40, height-250, "(no chart: fewer than two categories with a positive total)")
 
             c.drawString(40, height-440, "Top expenses:")
-            sorted_by_amt = sorted(cat_totals.items(), key=lambda kv: kv[1], reverse=True)
-            for i, (cat, amt) in enumerate(sorted_by_amt[:10], start=1):
-                c.drawString(50, height-460-20*i, f"{i}. {cat}: {PREFS.get('currency_symbol','₹')}{amt:.2f}")
+            t = c.beginText(50, height-480)
+            t.setFont("Helvetica", 10)
+            t.setLeading(20)
+            t.textLines("\n".join(f"{i}. {cat}: {sym}{amt:.2f}" for i, (cat, amt) in enumerate(ordered[:10], start=1)))
+            c.drawText(t)
 
             c.showPage()
             c.save()
-            wx.MessageBox(f"PDF report saved to {path}", "Saved", style=wx.OK | wx.ICON_INFORMATION)
+            wx.CallAfter(wx.MessageBox, f"PDF report saved to {path}", "Saved", style=wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
-            wx.MessageBox(f"Failed to create PDF: {e}", "Error", style=wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(wx.MessageBox, f"Failed to create PDF: {e}", "Error", style=wx.OK | wx.ICON_ERROR)
     else:
         try:
-            png_path = path.replace('.pdf', '.png')
-            with open(png_path, 'wb') as f:
-                f.write(buf.getvalue())
+            saved = []
+            if has_pie:
+                png_path = path.replace('.pdf', '.png')
+                _PIE_FIG.savefig(png_path, format="png", bbox_inches="tight", pad_inches=0.05)
+                saved.append(png_path)
             csv_path = path.replace('.pdf', '.csv')
-            with open(csv_path, 'w', newline='') as f:
+            with open(csv_path, 'w', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 writer.writerow(["Date","Category","Amount","Note"])
-                for r in rows:
-                    writer.writerow([r["Date"], r["Category"], r["Amount"], r.get("Note","")])
-            wx.MessageBox(f"Saved PNG+CSV:\n{ png_path }\n{ csv_path }\n\nInstall 'reportlab' for PDF.", "Saved", style=wx.OK | wx.ICON_INFORMATION)
+                writer.writerows((r["Date"], r["Category"], r["Amount"], r.get("Note","")) for r in rows)
+            saved.append(csv_path)
+            kind = "PNG+CSV" if has_pie else "CSV"
+            wx.CallAfter(wx.MessageBox, f"Saved {kind}:\n" + "\n".join(saved) + "\n\nInstall 'reportlab' for PDF.", "Saved", style=wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
-            wx.MessageBox(f"Failed to save: {e}", "Error", style=wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(wx.MessageBox, f"Failed to save: {e}", "Error", style=wx.OK | wx.ICON_ERROR)
 
 # -------------------------
 # Edit & Preferences Dialogs
@@ -954,13 +1449,7 @@ class EditExpenseDialog(wx.Dialog):
         except Exception:
             wx.MessageBox("Please enter a valid amount (optionally with currency symbol).", "Invalid", style=wx.OK | wx.ICON_ERROR)
             return
-        rows = read_expenses()
-        if 0 <= self.index < len(rows):
-            rows[self.index]["Date"] = new_date
-            rows[self.index]["Category"] = new_cat
-            rows[self.index]["Amount"] = new_amt
-            rows[self.index]["Note"] = new_note
-            write_expenses(rows)
+        if update_expense(self.index, new_date, new_cat, new_amt, new_note):
             wx.MessageBox("Saved.", "Saved", style=wx.OK | wx.ICON_INFORMATION)
             self.Close()
             refresh_all_windows()
@@ -970,10 +1459,7 @@ class EditExpenseDialog(wx.Dialog):
     def on_delete(self, event):
         confirm = wx.MessageBox("Delete this expense? This action cannot be undone.", "Confirm", style=wx.YES_NO | wx.ICON_WARNING)
         if confirm == wx.YES:
-            rows = read_expenses()
-            if 0 <= self.index < len(rows):
-                del rows[self.index]
-                write_expenses(rows)
+            if delete_expense(self.index):
                 wx.MessageBox("Deleted.", "Deleted", style=wx.OK | wx.ICON_INFORMATION)
                 self.Close()
                 refresh_all_windows()